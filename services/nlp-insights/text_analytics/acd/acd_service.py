@@ -1,11 +1,8 @@
 import json
 import logging
-import os
 
 from fhir.resources.codeableconcept import CodeableConcept
 from fhir.resources.dosage import Dosage, DosageDoseAndRate
-from fhir.resources.extension import Extension
-from fhir.resources.medicationstatement import MedicationStatement
 from fhir.resources.quantity import Quantity
 from fhir.resources.timing import Timing
 from ibm_cloud_sdk_core.authenticators.iam_authenticator import IAMAuthenticator
@@ -39,29 +36,28 @@ class ACDService(NLPService):
         self.acd_flow = config_dict["config"]["flow"]
         self.config_name = config_dict["name"]
         self.jsonString = json_string
-        config_dict = json.loads(json_string)
         if config_dict.get('version') is not None:
             self.version = config_dict.get('version')
-
-    def process(self, text):
-        service = acd.AnnotatorForClinicalDataV1(
+        # Built once per config so the IAM token is reused across requests
+        self.service = acd.AnnotatorForClinicalDataV1(
             authenticator=IAMAuthenticator(apikey=self.acd_key),
             version=self.version
         )
-        service.set_service_url(self.acd_url)
-        logger.info("Calling ACD-" + self.config_name)
-        resp = service.analyze_with_flow(self.acd_flow, text)
+        self.service.set_service_url(self.acd_url)
+
+    def process(self, text):
+        logger.info("Calling ACD-%s", self.config_name)
+        resp = self.service.analyze_with_flow(self.acd_flow, text)
         out = resp.to_dict()
         return out
 
-    def add_medications(self, nlp, diagnostic_report, nlp_output, med_statements_found, med_statements_insight_counter):
+    def add_medications(self, nlp, diagnostic_report, nlp_output, insight_detail, med_statement_tracker):
         medications = nlp_output.get('MedicationInd', [])
-        med_statements_found = {}
-        med_statements_insight_counter = {}
+        med_statement_tracker = {}
         for medication in medications:
-            med_statements_found, med_statements_insight_counter = create_insight(medication, nlp, nlp_output, diagnostic_report, ACDService.build_medication, med_statements_found, med_statements_insight_counter)
+            med_statement_tracker = create_insight(medication, nlp, insight_detail, diagnostic_report, ACDService.build_medication, med_statement_tracker)
 
-        return med_statements_found, med_statements_insight_counter
+        return med_statement_tracker
 
     @staticmethod
     def build_medication(med_statement, medication, insight_id):
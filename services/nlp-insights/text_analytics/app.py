@@ -40,12 +40,14 @@ def persist_config_helper(config_dict):
         raise KeyError("'config' must be a key in config")
     config_name = config_dict["name"]
     nlp_service_type = config_dict["nlpServiceType"]
-    if nlp_service_type.lower() not in all_nlp_services.keys():
+    if nlp_service_type.lower() not in all_nlp_services:
         raise ValueError("only 'acd' and 'quickumls' allowed at this time:" + nlp_service_type)
-    json_file = open(configDir + f'/{config_name}', 'w')
-    json_file.write(json.dumps(config_dict))
+    config_json = json.dumps(config_dict)
+    # Create the service first so an invalid config is not left on disk
+    new_nlp_service_object = all_nlp_services[nlp_service_type.lower()](config_json)
+    with open(configDir + f'/{config_name}', 'w') as json_file:
+        json_file.write(config_json)
 
-    new_nlp_service_object = all_nlp_services[nlp_service_type.lower()](json.dumps(config_dict))
     nlp_services_dict[config_dict["name"]] = new_nlp_service_object
     return config_name
 
@@ -69,9 +71,9 @@ def init_configs():
             details["flow"] = os.getenv("ACD_FLOW")
             tmp_config["config"] = details
             persist_config_helper(tmp_config)
-            logger.info("%s added:%s", tmp_config["name"], str(nlp_services_dict))
+            logger.info("%s added:%s", tmp_config["name"], nlp_services_dict)
         except Exception as ex:
-            logger.exception("Error when trying to persist initial config...skipping:%s", str(ex))
+            logger.exception("Error when trying to persist initial config...skipping:%s", ex)
 
     if os.getenv("QUICKUMLS_ENABLE_CONFIG") == 'true':
         # fill up a config for quickumls
@@ -83,12 +85,12 @@ def init_configs():
             details["endpoint"] = os.getenv("QUICKUMLS_ENDPOINT")
             tmp_config["config"] = details
             persist_config_helper(tmp_config)
-            logger.info("%s added:%s", tmp_config["name"], str(nlp_services_dict))
+            logger.info("%s added:%s", tmp_config["name"], nlp_services_dict)
         except Exception as ex:
-            logger.exception("Error when trying to persist initial config...skipping:%s", str(ex))
+            logger.exception("Error when trying to persist initial config...skipping:%s", ex)
 
     default_nlp_service = os.getenv("NLP_SERVICE_DEFAULT")
-    if default_nlp_service is not None and len(default_nlp_service) > 0:
+    if default_nlp_service:
         if default_nlp_service in nlp_services_dict:
             logger.info("Setting nlp service to %s", default_nlp_service)
             nlp_service = nlp_services_dict[default_nlp_service]
@@ -124,7 +126,7 @@ def persist_config():
         request_str = request.data.decode('utf-8')
         config_dict = json.loads(request_str)
         config_name = persist_config_helper(config_dict)
-        logger.info("%s added:%s", config_name, str(nlp_services_dict))
+        logger.info("%s added:%s", config_name, nlp_services_dict)
     except Exception as ex:
         logger.exception("Error when trying to persist given config.")
         return Response("Error when trying to persist given config-" + str(ex), status=400)
@@ -138,18 +140,16 @@ def delete_config(config_name):
     try:
         if config_name not in nlp_services_dict:
             raise KeyError(config_name + " must exist")
-        if nlp_service is not None:
-            current_config = json.loads(nlp_service.jsonString)
-            if config_name == current_config["name"]:
-                raise Exception("Cannot delete the default nlp service")
-        if config_name in list(override_resource_config.values()):
+        if nlp_service is not None and config_name == nlp_service.config_name:
+            raise Exception("Cannot delete the default nlp service")
+        if config_name in override_resource_config.values():
             raise ValueError(config_name + " has an existing override and cannot be deleted")
         os.remove(configDir + f'/{config_name}')
         del nlp_services_dict[config_name]
     except Exception as ex:
         logger.exception("Error when trying to delete config")
         return Response("Error when trying to delete config-" + str(ex), status=400)
-    logger.info("Config successfully deleted: " + config_name)
+    logger.info("Config successfully deleted: %s", config_name)
     return Response("Config successfully deleted: " + config_name, status=200)
 
 
@@ -262,7 +262,6 @@ def discover_insights():
     fhir_data = json.loads(request.data)  # could be resource or bundle
 
     input_type = fhir_data['resourceType']
-    resp_string = None
     new_entries = []
     if input_type == 'Bundle':
         entrylist = fhir_data['entry']
@@ -279,17 +278,26 @@ def discover_insights():
         for new_entry in new_entries:
             entrylist.append(new_entry)  # add new resources to bundle
 
-        resp_string = fhir_data
+        return_response = json.dumps(fhir_data)  # back to string
     else:
-        resp_string = process_resource(fhir_data)  # single resource so just return response
-
-    return_response = json.dumps(resp_string)  # back to string
+        # single resource so just return response, the enhanced resource is already a json string
+        return_response = enhance_resource(fhir_data)
+        if return_response is None:
+            return_response = json.dumps(fhir_data)
 
     return Response(return_response, status=200, mimetype='application/json')
 
 
 def process_resource(request_data):
     """Generate insights for a single resource"""
+    resp = enhance_resource(request_data)
+    if resp is None:
+        return request_data
+    return json.loads(resp)
+
+
+def enhance_resource(request_data):
+    """Generate insights for a single resource, returns the json string or None if the resource is not handled"""
     global nlp_service
     resource_type = request_data['resourceType']
     logger.info("Processing resource type: %s", resource_type)
@@ -298,18 +306,17 @@ def process_resource(request_data):
         nlp_service = nlp_services_dict[override_resource_config[resource_type]]
         logger.info("NLP engine override for %s using %s", resource_type, override_resource_config[resource_type])
 
-    if resource_type in nlp_service.types_can_handle:
-        enhance_func = nlp_service.types_can_handle[resource_type]
+    enhance_func = nlp_service.types_can_handle.get(resource_type)
+    if enhance_func is not None:
         resp = enhance_func(nlp_service, request_data)
-        json_response = json.loads(resp)
 
         logger.info("Resource successfully updated")
         nlp_service = nlp_service_backup
-        return json_response
+        return resp
     else:
         logger.info("Resource not handled so respond back with original")
         nlp_service = nlp_service_backup
-        return request_data
+        return None
 
 
 if __name__ == "__main__":
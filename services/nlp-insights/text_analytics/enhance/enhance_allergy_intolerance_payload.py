@@ -20,13 +20,13 @@ def enhance_allergy_intolerance_payload_to_fhir(nlp, input_json):
     if allergy_intolerance_fhir.code and allergy_intolerance_fhir.code.text:
         text = adjust_allergy_text(allergy_intolerance_fhir.code.text)
         nlp_resp = nlp.process(text)
-        nlp_results.append([allergy_intolerance_fhir.code, nlp_resp])
+        nlp_results.append((allergy_intolerance_fhir.code, nlp_resp))
 
     if allergy_intolerance_fhir.reaction:
         for reaction in allergy_intolerance_fhir.reaction:
             for mf in reaction.manifestation:
                 nlp_resp = nlp.process(mf.text)
-                nlp_results.append([mf, nlp_resp])
+                nlp_results.append((mf, nlp_resp))
 
     if nlp_results:
         result_allergy = update_allergy_with_insights(nlp, allergy_intolerance_fhir, nlp_results)
@@ -1,8 +1,7 @@
 import logging
 
 from fhir.resources.diagnosticreport import DiagnosticReport
-from text_analytics.insights.add_insights_condition import create_conditions_from_insights
-from text_analytics.insights.add_insights_medication import create_med_statements_from_insights
+from text_analytics.enhance.enhance_unstructured_text import create_unstructured_insights_bundle
 from text_analytics.utils import fhir_object_utils
 
 logger = logging.getLogger()
@@ -13,25 +12,8 @@ def enhance_diagnostic_report_payload_to_fhir(nlp, diagnostic_report_json):
     a FHIR bundle resource with additional insights.
 
     """
-    bundle_entries = []
-
     diagnostic_report_fhir = DiagnosticReport.parse_obj(diagnostic_report_json)
     text = fhir_object_utils.get_diagnostic_report_data(diagnostic_report_fhir)
-    if text:
-        nlp_resp = nlp.process(text)
-        create_conditions_fhir = create_conditions_from_insights(nlp, diagnostic_report_fhir, nlp_resp)
-        create_med_statements_fhir = create_med_statements_from_insights(nlp, diagnostic_report_fhir, nlp_resp)
-
-        if create_conditions_fhir:
-            for condition in create_conditions_fhir:
-                bundle_entry = [condition, 'POST', condition.resource_type]
-                bundle_entries.append(bundle_entry)
-
-        if create_med_statements_fhir:
-            for med_statement in create_med_statements_fhir:
-                bundle_entry = [med_statement, 'POST', med_statement.resource_type]
-                bundle_entries.append(bundle_entry)
-
-    bundle = fhir_object_utils.create_transaction_bundle(bundle_entries)
+    bundle = create_unstructured_insights_bundle(nlp, diagnostic_report_fhir, text)
 
     return bundle.json()
@@ -0,0 +1,32 @@
+from text_analytics.insights.add_insights_condition import create_conditions_from_insights
+from text_analytics.insights.add_insights_medication import create_med_statements_from_insights
+from text_analytics.utils import fhir_object_utils
+
+
+def create_unstructured_insights_bundle(nlp, resource, text):
+    """
+    Given an NLP service, a resource with unstructured text and that text, returns a FHIR
+    transaction bundle for the conditions and medication statements derived from the text.
+
+    If there is no text, the bundle has no entries.
+    """
+    bundle_entries = []
+
+    if text:
+        nlp_resp = nlp.process(text)
+        # shared so the response is encoded at most once for both resource types
+        insight_detail = fhir_object_utils.InsightDetail(nlp_resp)
+        create_conditions_fhir = create_conditions_from_insights(nlp, resource, nlp_resp, insight_detail)
+        create_med_statements_fhir = create_med_statements_from_insights(nlp, resource, nlp_resp, insight_detail)
+
+        if create_conditions_fhir:
+            for condition in create_conditions_fhir:
+                bundle_entry = (condition, 'POST', condition.resource_type)
+                bundle_entries.append(bundle_entry)
+
+        if create_med_statements_fhir:
+            for med_statement in create_med_statements_fhir:
+                bundle_entry = (med_statement, 'POST', med_statement.resource_type)
+                bundle_entries.append(bundle_entry)
+
+    return fhir_object_utils.create_transaction_bundle(bundle_entries)
@@ -2,17 +2,21 @@ from fhir.resources.extension import Extension
 from text_analytics.insights import insight_constants
 from text_analytics.utils import fhir_object_utils
 
+# Concept types that indicate an allergy manifestation
+ALLERGY_TYPES = frozenset(["umls.DiseaseOrSyndrome", "umls.PathologicFunction", "umls.SignOrSymptom"])
+
 
 def update_allergy_with_insights(nlp, allergy, nlp_results):
     insight_num = 0
     for codeable_concept, nlp_response in nlp_results:
         concepts = nlp_response["concepts"]
         if concepts is not None:
+            insight_detail = fhir_object_utils.InsightDetail(nlp_response)
             for concept in concepts:
                 the_type = concept['type']
-                if isinstance(the_type, str):
-                    the_type = [the_type]
-                if len(set(the_type) & set(["umls.DiseaseOrSyndrome", "umls.PathologicFunction", "umls.SignOrSymptom"])) > 0:
+                if type(the_type) is str:
+                    the_type = (the_type,)
+                if not ALLERGY_TYPES.isdisjoint(the_type):
                     insight_num = insight_num + 1
                     insight_id = "insight-" + str(insight_num)
 
@@ -24,8 +28,8 @@ def update_allergy_with_insights(nlp, allergy, nlp_results):
                     insight.url = insight_constants.INSIGHT_INSIGHT_ENTRY_URL
                     insight_id_ext = fhir_object_utils.create_insight_extension(insight_id, insight_constants.INSIGHT_ID_STRUCTURED_SYSTEM)
                     insight.extension = [insight_id_ext]
-                    insight_detail = fhir_object_utils.create_insight_detail_extension(nlp_response)
-                    insight.extension.append(insight_detail)
+                    insight_detail_ext = fhir_object_utils.create_insight_detail_extension(insight_detail)
+                    insight.extension.append(insight_detail_ext)
 
                     fhir_object_utils.add_resource_meta_structured(nlp, allergy)
                     if allergy.meta.extension is None:
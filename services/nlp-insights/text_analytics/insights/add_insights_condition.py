@@ -5,22 +5,27 @@ from fhir.resources.extension import Extension
 from text_analytics.insights import insight_constants
 from text_analytics.utils import fhir_object_utils
 
+# Concept types that indicate a condition
+CONDITION_TYPES = frozenset(["ICDiagnosis", 'umls.DiseaseOrSyndrome', 'umls.PathologicFunction', 'umls.SignOrSymptom', 'umls.NeoplasticProcess',
+                             'umls.CellOrMolecularDysfunction', 'umls.MentalOrBehavioralDysfunction'])
 
-def _build_resource(nlp, diagnostic_report, nlp_output):
+
+def _build_resource(nlp, diagnostic_report, nlp_output, insight_detail):
     nlp_name = type(nlp).__name__
     nlp_concepts = nlp_output.get('concepts')
     conditions_found = {}            # key is UMLS ID, value is the FHIR resource
     conditions_insight_counter = {}  # key is UMLS ID, value is the current insight_id_num
     for concept in nlp_concepts:
         the_type = concept['type']
-        if isinstance(the_type, str):
-            the_type = [the_type]
-        if len(set(the_type) & set(["ICDiagnosis", 'umls.DiseaseOrSyndrome', 'umls.PathologicFunction', 'umls.SignOrSymptom', 'umls.NeoplasticProcess',
-        'umls.CellOrMolecularDysfunction', 'umls.MentalOrBehavioralDysfunction'])) > 0:
+        if type(the_type) is str:
+            the_type = (the_type,)
+        if not CONDITION_TYPES.isdisjoint(the_type):
             condition = conditions_found.get(concept["cui"])
             if condition is None:
                 condition = Condition.construct()
                 condition.meta = fhir_object_utils.add_resource_meta_unstructured(nlp, diagnostic_report)
+                condition.subject = diagnostic_report.subject
+                fhir_object_utils.create_derived_resource_extension(condition)
                 conditions_found[concept["cui"]] = condition
                 insight_id_num = 1
             else:
@@ -34,8 +39,8 @@ def _build_resource(nlp, diagnostic_report, nlp_output):
 
             insight_id_ext = fhir_object_utils.create_insight_extension(insight_id_string, insight_constants.INSIGHT_ID_UNSTRUCTURED_SYSTEM)
             insight.extension = [insight_id_ext]
-            insight_detail = fhir_object_utils.create_insight_detail_extension(nlp_output)
-            insight.extension.append(insight_detail)
+            insight_detail_ext = fhir_object_utils.create_insight_detail_extension(insight_detail)
+            insight.extension.append(insight_detail_ext)
             insight_span = fhir_object_utils.create_insight_span_extension(concept)
             insight.extension.append(insight_span)
             if "insightModelData" in concept:
@@ -43,7 +48,7 @@ def _build_resource(nlp, diagnostic_report, nlp_output):
             result_extension = condition.meta.extension[0]
             result_extension.extension.append(insight)
 
-    if len(conditions_found) == 0:
+    if not conditions_found:
         return None
     return list(conditions_found.values())
 
@@ -57,10 +62,5 @@ def _build_resource_data(condition, concept, insight_id):
     fhir_object_utils.add_codings(concept, condition.code, insight_id, insight_constants.INSIGHT_ID_UNSTRUCTURED_SYSTEM)
 
 
-def create_conditions_from_insights(nlp, diagnostic_report, nlp_output):
-    conditions = _build_resource(nlp, diagnostic_report, nlp_output)
-    if conditions is not None:
-        for condition in conditions:
-            condition.subject = diagnostic_report.subject
-            fhir_object_utils.create_derived_resource_extension(condition)
-    return conditions
+def create_conditions_from_insights(nlp, diagnostic_report, nlp_output, insight_detail):
+    return _build_resource(nlp, diagnostic_report, nlp_output, insight_detail)
@@ -7,6 +7,9 @@ from fhir.resources.codeableconcept import CodeableConcept
 
 logger = logging.getLogger()
 
+# Concept types that indicate a vaccine
+IMMUNIZATION_TYPES = frozenset(["ICMedication", "umls.ImmunologicFactor"])
+
 """
 Parameters:
   immunization: FHIR immunization resource object that is updated
@@ -17,11 +20,12 @@ def update_immunization_with_insights(nlp, immunization, nlp_results):
     insight_num = 0
     concepts = nlp_results["concepts"]
     if concepts is not None:
+        insight_detail = fhir_object_utils.InsightDetail(nlp_results)
         for concept in concepts:
             the_type = concept['type']
-            if isinstance(the_type, str):
-                the_type = [the_type]
-            if len(set(the_type) & set(["ICMedication", "umls.ImmunologicFactor"])) > 0:
+            if type(the_type) is str:
+                the_type = (the_type,)
+            if not IMMUNIZATION_TYPES.isdisjoint(the_type):
                 # Add a new insight
                 insight_num = insight_num + 1
                 insight_id = "insight-" + str(insight_num)
@@ -39,8 +43,8 @@ def update_immunization_with_insights(nlp, immunization, nlp_results):
                 insight_id_ext = fhir_object_utils.create_insight_extension(insight_id, insight_constants.INSIGHT_ID_STRUCTURED_SYSTEM)
                 insight.extension = [insight_id_ext]
                 # Save ACD response
-                insight_detail = fhir_object_utils.create_insight_detail_extension(nlp_results)
-                insight.extension.append(insight_detail)
+                insight_detail_ext = fhir_object_utils.create_insight_detail_extension(insight_detail)
+                insight.extension.append(insight_detail_ext)
 
                 # Add meta if any insights were added
                 fhir_object_utils.add_resource_meta_structured(nlp, immunization)
@@ -57,18 +61,3 @@ def update_immunization_with_insights(nlp, immunization, nlp_results):
         return None
 
     return immunization
-
-'''
-Adds insights in the FHIR immunization resource (vaccineCode field) for the codes in the ACD Concept.
-Parameters:
-  immunization: FHIR immunization resource being updates
-  concept: Concept with insight being added to FHIR resource
-  insight_id: ID of the insight to reference for the codes added
-'''
-def _build_resource_data(immunization, concept, insight_id):
-    if immunization.vaccineCode is None:
-        codeable_concept = CodeableConcept.construct()
-        codeable_concept.text = concept["preferredName"]
-        immunization.vaccineCode = codeable_concept
-        codeable_concept.coding = []
-    fhir_object_utils.add_codings(concept, immunization.vaccineCode, insight_id, insight_constants.INSIGHT_ID_STRUCTURED_SYSTEM)
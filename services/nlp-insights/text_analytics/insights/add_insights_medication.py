@@ -1,16 +1,16 @@
 import logging
 
 from fhir.resources.codeableconcept import CodeableConcept
-from fhir.resources.dosage import Dosage, DosageDoseAndRate
 from fhir.resources.extension import Extension
 from fhir.resources.medicationstatement import MedicationStatement
-from fhir.resources.quantity import Quantity
-from fhir.resources.timing import Timing
 from text_analytics.insights import insight_constants
 from text_analytics.utils import fhir_object_utils
 
 logger = logging.getLogger()
 
+# UMLS semantic types that indicate a medication concept
+MEDICATION_TYPES = frozenset(['umls.Antibiotic', 'umls.ClinicalDrug', 'umls.PharmacologicSubstance', 'umls.OrganicChemical'])
+
 def _create_med_statement_from_template():
 
     med_statement_template = {
@@ -24,44 +24,45 @@ def _create_med_statement_from_template():
     return med_statement
 
 
-def _build_resource(nlp, diagnostic_report, nlp_output):
+def _build_resource(nlp, diagnostic_report, nlp_output, insight_detail):
     concepts = nlp_output.get('concepts')
-    med_statements_found = {}            # key is UMLS ID, value is the FHIR resource
-    med_statements_insight_counter = {}  # key is UMLS ID, value is the current insight_num
+    med_statement_tracker = {}  # key is UMLS ID, value is (FHIR resource, current insight_num)
 
     if hasattr(nlp, 'add_medications'):
-        med_statements_found, med_statements_insight_counter = nlp.add_medications(nlp, diagnostic_report, nlp_output, med_statements_found, med_statements_insight_counter)
+        med_statement_tracker = nlp.add_medications(nlp, diagnostic_report, nlp_output, insight_detail, med_statement_tracker)
 
     for concept in concepts:
         the_type = concept['type']
-        if isinstance(the_type, str):
-            the_type = [the_type]
-        if len(set(the_type) & set(['umls.Antibiotic', 'umls.ClinicalDrug', 'umls.PharmacologicSubstance', 'umls.OrganicChemical'])) > 0:
-            med_statements_found, med_statements_insight_counter = create_insight(concept, nlp, nlp_output, diagnostic_report, _build_resource_data, med_statements_found, med_statements_insight_counter)
+        if type(the_type) is str:
+            the_type = (the_type,)
+        if not MEDICATION_TYPES.isdisjoint(the_type):
+            med_statement_tracker = create_insight(concept, nlp, insight_detail, diagnostic_report, _build_resource_data, med_statement_tracker)
 
-    if len(med_statements_found) == 0:
+    if not med_statement_tracker:
         return None
-    return list(med_statements_found.values())
+    return [med_statement for med_statement, _ in med_statement_tracker.values()]
 
-def create_insight(concept, nlp, nlp_output, diagnostic_report, build_resource, med_statements_found, med_statements_insight_counter):
+def create_insight(concept, nlp, insight_detail, diagnostic_report, build_resource, med_statement_tracker):
     cui = concept.get('cui')
-    med_statement = med_statements_found.get(cui)
-    if med_statement is None:
+    tracker_entry = med_statement_tracker.get(cui)
+    if tracker_entry is None:
         med_statement = _create_med_statement_from_template()
         med_statement.meta = fhir_object_utils.add_resource_meta_unstructured(nlp, diagnostic_report)
-        med_statements_found[cui] = med_statement
+        med_statement.subject = diagnostic_report.subject
+        fhir_object_utils.create_derived_resource_extension(med_statement)
         insight_num = 1
     else:
-        insight_num = med_statements_insight_counter[cui] + 1
-    med_statements_insight_counter[cui] = insight_num
+        med_statement, insight_num = tracker_entry
+        insight_num = insight_num + 1
+    med_statement_tracker[cui] = (med_statement, insight_num)
     insight_id = "insight-" + str(insight_num)
     build_resource(med_statement, concept, insight_id)
     insight = Extension.construct()
     insight.url = insight_constants.INSIGHT_INSIGHT_ENTRY_URL
     insight_id_ext = fhir_object_utils.create_insight_extension(insight_id, insight_constants.INSIGHT_ID_UNSTRUCTURED_SYSTEM)
     insight.extension = [insight_id_ext]
-    insight_detail = fhir_object_utils.create_insight_detail_extension(nlp_output)
-    insight.extension.append(insight_detail)
+    insight_detail_ext = fhir_object_utils.create_insight_detail_extension(insight_detail)
+    insight.extension.append(insight_detail_ext)
     insight_span = fhir_object_utils.create_insight_span_extension(concept)
     insight.extension.append(insight_span)
     insight_model_data = concept.get('insightModelData')
@@ -69,7 +70,7 @@ def create_insight(concept, nlp, nlp_output, diagnostic_report, build_resource,
         fhir_object_utils.add_medication_confidences(insight.extension, insight_model_data)
     result_extension = med_statement.meta.extension[0]
     result_extension.extension.append(insight)
-    return med_statements_found, med_statements_insight_counter
+    return med_statement_tracker
 
 def _build_resource_data(med_statement, concept, insight_id):
     if med_statement.status is None:
@@ -85,10 +86,5 @@ def _build_resource_data(med_statement, concept, insight_id):
 
     fhir_object_utils.add_codings_drug(concept, drug, med_statement.medicationCodeableConcept, insight_id, insight_constants.INSIGHT_ID_UNSTRUCTURED_SYSTEM)
 
-def create_med_statements_from_insights(nlp, diagnostic_report, nlp_output):
-    med_statements = _build_resource(nlp, diagnostic_report, nlp_output)
-    if med_statements is not None:
-        for med_statement in med_statements:
-            med_statement.subject = diagnostic_report.subject
-            fhir_object_utils.create_derived_resource_extension(med_statement)
-    return med_statements
+def create_med_statements_from_insights(nlp, diagnostic_report, nlp_output, insight_detail):
+    return _build_resource(nlp, diagnostic_report, nlp_output, insight_detail)
@@ -1,11 +1,9 @@
 import json
 import logging
 import requests
-import os
 
 from text_analytics.abstract_nlp_service import NLPService
 from text_analytics.enhance import *
-from text_analytics.quickUMLS.semtype_lookup import lookup
 from text_analytics.quickUMLS.semtype_lookup import get_semantic_type_list
 
 logger = logging.getLogger()
@@ -32,7 +30,7 @@ class QuickUMLSService(NLPService):
             request_body = {"text": text.decode('utf-8')}
         else:
             request_body = {"text": text}
-        logger.info("Calling QUICKUMLS-" + self.config_name)
+        logger.info("Calling QUICKUMLS-%s", self.config_name)
         resp = requests.post(self.quickUMLS_url, json=request_body)
         concepts = json.loads(resp.text)
         conceptsList = []
@@ -45,11 +43,12 @@ class QuickUMLSService(NLPService):
     def concept_to_dict(concept):
         output = {"Structure": "Concept"}
         output["generatingService"] = "quickUMLS"
-        output["coveredText"] = concept["ngram"] if "ngram" in concept else None
-        output["cui"] = concept["cui"] if "cui" in concept else None
-        output["begin"] = concept["start"] if "start" in concept else None
-        output["end"] = concept["end"] if "end" in concept else None
-        output["preferredName"] = concept["term"] if "term" in concept else None
-        output["type"] = get_semantic_type_list(concept["semtypes"]) if "semtypes" in concept and len(concept["semtypes"]) > 0 else None
+        output["coveredText"] = concept.get("ngram")
+        output["cui"] = concept.get("cui")
+        output["begin"] = concept.get("start")
+        output["end"] = concept.get("end")
+        output["preferredName"] = concept.get("term")
+        semtypes = concept.get("semtypes")
+        output["type"] = get_semantic_type_list(semtypes) if semtypes else None
         output["negated"] = False
         return output
@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+from fhir.resources.codeableconcept import CodeableConcept
+
+from text_analytics.insights import insight_constants
+from text_analytics.utils import fhir_object_utils
+
+
+def _confidences(insight_ext):
+    # each confidence extension holds the confidence name followed by the score
+    return [(ext.extension[0].valueString, ext.extension[1].valueString) for ext in insight_ext]
+
+
+class TestAddDiagnosisConfidences(unittest.TestCase):
+
+    def test_usage_and_diagnosis_scores(self):
+        # shaped like InsightModelDataDiagnosis.to_dict() from ibm-whcs-sdk
+        insight_model_data = {
+            'diagnosis': {
+                'usage': {'explicitScore': '0.9', 'patientReportedScore': '0.1', 'discussedScore': '0.2'},
+                'suspectedScore': '0.3',
+                'familyHistoryScore': '0.4'
+            }
+        }
+        insight_ext = []
+        fhir_object_utils.add_diagnosis_confidences(insight_ext, insight_model_data)
+
+        self.assertEqual([(insight_constants.CONFIDENCE_SCORE_EXPLICIT, '0.9'),
+                          (insight_constants.CONFIDENCE_SCORE_PATIENT_REPORTED, '0.1'),
+                          (insight_constants.CONFIDENCE_SCORE_DISCUSSED, '0.2'),
+                          (insight_constants.CONFIDENCE_SCORE_FAMILY_HISTORY, '0.4'),
+                          (insight_constants.CONFIDENCE_SCORE_SUSPECTED, '0.3')],
+                         _confidences(insight_ext))
+
+    def test_diagnosis_scores_without_usage(self):
+        # to_dict() leaves out usage when ACD does not report it
+        insight_model_data = {'diagnosis': {'suspectedScore': '0.3'}}
+        insight_ext = []
+        fhir_object_utils.add_diagnosis_confidences(insight_ext, insight_model_data)
+
+        self.assertEqual([(insight_constants.CONFIDENCE_SCORE_SUSPECTED, '0.3')], _confidences(insight_ext))
+
+    def test_missing_scores_are_skipped(self):
+        insight_model_data = {'diagnosis': {'usage': {'explicitScore': '0.9'}}}
+        insight_ext = []
+        fhir_object_utils.add_diagnosis_confidences(insight_ext, insight_model_data)
+
+        self.assertEqual([(insight_constants.CONFIDENCE_SCORE_EXPLICIT, '0.9')], _confidences(insight_ext))
+
+    def test_no_diagnosis(self):
+        insight_ext = []
+        fhir_object_utils.add_diagnosis_confidences(insight_ext, {})
+
+        self.assertEqual([], insight_ext)
+
+
+class TestCreateCodingEntries(unittest.TestCase):
+
+    def test_delimited_codes_are_stripped(self):
+        codeable_concept = CodeableConcept.construct(coding=[])
+        fhir_object_utils.create_coding_entries(codeable_concept, insight_constants.SNOMED_URL, "1, 11,,",
+                                                "insight-1", insight_constants.INSIGHT_ID_UNSTRUCTURED_SYSTEM)
+
+        self.assertEqual(["1", "11"], [coding.code for coding in codeable_concept.coding])
+
+    def test_repeated_code_adds_insight_id(self):
+        codeable_concept = CodeableConcept.construct(coding=[])
+        for insight_id in ["insight-1", "insight-2"]:
+            fhir_object_utils.create_coding_entries(codeable_concept, insight_constants.SNOMED_URL, "1",
+                                                    insight_id, insight_constants.INSIGHT_ID_UNSTRUCTURED_SYSTEM)
+
+        self.assertEqual(1, len(codeable_concept.coding))
+        insight_ids = [ext.valueIdentifier.value for ext in codeable_concept.coding[0].extension[0].extension[1:]]
+        self.assertEqual(["insight-1", "insight-2"], insight_ids)
+
+
+class TestInsightDetail(unittest.TestCase):
+
+    def test_encoded_once_when_used(self):
+        with mock.patch.object(fhir_object_utils, 'encode_insight_detail',
+                               wraps=fhir_object_utils.encode_insight_detail) as encode:
+            insight_detail = fhir_object_utils.InsightDetail({'concepts': []})
+            encode.assert_not_called()
+
+            first = fhir_object_utils.create_insight_detail_extension(insight_detail)
+            second = fhir_object_utils.create_insight_detail_extension(insight_detail)
+
+        encode.assert_called_once_with({'concepts': []})
+        self.assertEqual(first.valueAttachment.data, second.valueAttachment.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
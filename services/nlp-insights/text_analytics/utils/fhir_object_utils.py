@@ -13,13 +13,15 @@ from fhir.resources.reference import Reference
 from text_analytics.insights import insight_constants
 
 
-def create_coding(system, code, display=None):
-    coding_element = Coding.construct()
-    coding_element.system = system
-    coding_element.code = code
+# Fields are passed to construct() because FHIR models validate every attribute
+# assignment, which codings would otherwise pay for each field.
+def create_coding(system, code, display=None, extension=None):
+    fields = {"system": system, "code": code}
     if display is not None:
-        coding_element.display = display
-    return coding_element
+        fields["display"] = display
+    if extension is not None:
+        fields["extension"] = extension
+    return Coding.construct(**fields)
 
 
 def create_confidence(name, value):
@@ -64,10 +66,9 @@ def create_insight_reference(insight_id, insight_system):
 
 
 # Creating coding system entry with the extensions for classfication/insight id
-def create_coding_system_entry(coding_system_url, code_id, insight_id, insight_system):
-    coding = create_coding(coding_system_url, code_id)
-    coding.extension = [create_insight_reference(insight_id, insight_system)]
-    return coding
+def create_coding_system_entry(coding_system_url, code_id, insight_id, insight_system, display=None):
+    return create_coding(coding_system_url, code_id, display,
+                         [create_insight_reference(insight_id, insight_system)])
 
 
 # Adds extension with insight id
@@ -84,21 +85,15 @@ def add_insight_id(object_extension, insight_id, insight_system):
 
 
 # fhir_resource_action --> list of resource(s) with their request type ('POST' or 'PUT') and url
-#                    example: [[resource1, 'POST', 'url1'], [resource2, 'PUT', 'url2']]
+#                    example: [(resource1, 'POST', 'url1'), (resource2, 'PUT', 'url2')]
+# The entries are built from our own resources and known request values,
+# so they are constructed without validation like the rest of the insight objects.
 def create_transaction_bundle(fhir_resource_action):
-    bundle = Bundle.construct()
-    bundle.type = "transaction"
-    bundle.entry = []
+    bundle = Bundle.construct(type="transaction", entry=[])
 
     for resource, request_type, url in fhir_resource_action:
-        bundle_entry = BundleEntry.construct()
-        bundle_entry.resource = resource
-        json = {
-            "method": request_type,
-            "url": url
-        }
-        request = BundleEntryRequest.parse_obj(json)
-        bundle_entry.request = request
+        request = BundleEntryRequest.construct(method=request_type, url=url)
+        bundle_entry = BundleEntry.construct(resource=resource, request=request)
         bundle.entry.append(bundle_entry)
 
     return bundle
@@ -212,26 +207,55 @@ def create_insight_extension(insight_id_string, insight_system):
     return insight_id_ext
 
 
-def create_insight_detail_extension(nlp_output):
+# Encodes the full NLP output for the insight detail extension.
+def encode_insight_detail(nlp_output):
     nlp_dict = nlp_output # .to_dict()
     nlp_dict_string = json.dumps(nlp_dict)  # get the string
     nlp_as_bytes = nlp_dict_string.encode('utf-8')  # convert to bytes including utf8 content
     nlp_base64_encoded_bytes = base64.b64encode(nlp_as_bytes)  # encode to base64
     nlp_base64_ascii_string = nlp_base64_encoded_bytes.decode("ascii")  # convert base64 bytes to ascii characters
-    insight_detail = Extension.construct()
-    insight_detail.url = insight_constants.INSIGHT_EVIDENCE_DETAIL_URL
+    return nlp_base64_ascii_string
+
+
+class InsightDetail:
+    '''
+    Insight detail for one NLP response.
+    Every insight from the same response carries the same data, so the response is
+    encoded when the first insight needs it and reused for the rest. Responses that
+    produce no insights are never encoded.
+    '''
+
+    def __init__(self, nlp_output):
+        self.nlp_output = nlp_output
+        self._data = None
+
+    def data(self):
+        if self._data is None:
+            self._data = encode_insight_detail(self.nlp_output)
+        return self._data
+
+
+def create_insight_detail_extension(insight_detail):
+    insight_detail_ext = Extension.construct()
+    insight_detail_ext.url = insight_constants.INSIGHT_EVIDENCE_DETAIL_URL
     attachment = Attachment.construct()
     attachment.contentType = "json"
-    attachment.data = nlp_base64_ascii_string  # data is an ascii string of encoded data
-    insight_detail.valueAttachment = attachment
-    return insight_detail
+    attachment.data = insight_detail.data()  # data is an ascii string of encoded data
+    insight_detail_ext.valueAttachment = attachment
+    return insight_detail_ext
 
 
 # ACD will often return multiple codes from one system in a comma delimited list
 # Split the list, then create a separate coding system entry for each one
 def create_coding_entries(codeable_concept, code_url, code_ids, insight_id, insight_system):
-    ids = code_ids.split(",")
+    # most values hold a single code, so only split when there is a delimiter
+    ids = code_ids.split(",") if "," in code_ids else (code_ids,)
     for id in ids:
+        # codings are constructed without validation, so drop the whitespace
+        # and empty values that NLP delimited lists can contain
+        id = id.strip()
+        if not id:
+            continue
         code_entry = find_codable_concept(codeable_concept, id, code_url)
         if code_entry is not None and code_entry.extension is not None and code_entry.extension[
             0].url == insight_constants.INSIGHT_REFERENCE_URL:
@@ -254,8 +278,8 @@ def add_codings(concept, codeable_concept, insight_id, insight_system):
             add_insight_id(code_entry.extension[0].extension, insight_id, insight_system)
         else:
             # the Concept exists, but no derived extension
-            coding = create_coding_system_entry(insight_constants.UMLS_URL, concept['cui'], insight_id, insight_system)
-            coding.display = concept["preferredName"]
+            coding = create_coding_system_entry(insight_constants.UMLS_URL, concept['cui'], insight_id, insight_system,
+                                                concept["preferredName"])
             codeable_concept.coding.append(coding)
     if "snomedConceptId" in concept:
         create_coding_entries(codeable_concept, insight_constants.SNOMED_URL, concept["snomedConceptId"], insight_id,
@@ -281,23 +305,23 @@ def add_codings(concept, codeable_concept, insight_id, insight_system):
 
 
 def add_codings_drug(drug, drug_name, codeable_concept, insight_id, insight_system):
-    if drug.get("cui") is not None:
+    cui = drug.get("cui")
+    if cui is not None:
         # For CUIs, we do not handle comma-delimited values (have not seen that we ever have more than one value)
         # We use the preferred name from UMLS for the display text
-        code_entry = find_codable_concept(codeable_concept, drug.get("cui"), insight_constants.UMLS_URL)
+        code_entry = find_codable_concept(codeable_concept, cui, insight_constants.UMLS_URL)
         if code_entry is not None and code_entry.extension is not None and code_entry.extension[
             0].url == insight_constants.INSIGHT_REFERENCE_URL:
             # there is already a derived extension
             add_insight_id(code_entry.extension[0].extension, insight_id, insight_system)
         else:
             # the Concept exists, but no derived extension
-            coding = create_coding_system_entry(insight_constants.UMLS_URL, drug.get("cui"), insight_id,
-                                                insight_system)
-
-            coding.display = drug_name
+            coding = create_coding_system_entry(insight_constants.UMLS_URL, cui, insight_id,
+                                                insight_system, drug_name)
             codeable_concept.coding.append(coding)
-    if drug.get("rxNormID") is not None:
-        create_coding_entries(codeable_concept, insight_constants.RXNORM_URL, drug.get("rxNormID"), insight_id,
+    rx_norm_id = drug.get("rxNormID")
+    if rx_norm_id is not None:
+        create_coding_entries(codeable_concept, insight_constants.RXNORM_URL, rx_norm_id, insight_id,
                               insight_system)
 
 
@@ -310,34 +334,40 @@ def find_codable_concept(codeable_concept, id, system):
     Returns the entry if found, or None if not found.
     '''
     for entry in codeable_concept.coding:
-        if entry.system == system and entry.code == id:
+        # codes differ far more often than systems, so check the code first
+        if entry.code == id and entry.system == system:
             return entry
     return None
 
 
+# Diagnosis usage scores reported by ACD and the confidence name used for each
+DIAGNOSIS_USAGE_CONFIDENCES = (
+    ('explicitScore', insight_constants.CONFIDENCE_SCORE_EXPLICIT),
+    ('patientReportedScore', insight_constants.CONFIDENCE_SCORE_PATIENT_REPORTED),
+    ('discussedScore', insight_constants.CONFIDENCE_SCORE_DISCUSSED),
+)
+
+# Diagnosis scores that ACD reports directly on the diagnosis, not under usage
+DIAGNOSIS_CONFIDENCES = (
+    ('familyHistoryScore', insight_constants.CONFIDENCE_SCORE_FAMILY_HISTORY),
+    ('suspectedScore', insight_constants.CONFIDENCE_SCORE_SUSPECTED),
+)
+
+
 def add_diagnosis_confidences(insight_ext, insight_model_data):
-    if insight_model_data['diagnosis'] is not None:
-        if insight_model_data['diagnosis']['usage'] is not None:
-            if 'explicitScore' in insight_model_data['diagnosis']['usage'] and insight_model_data['diagnosis']['usage']['explicitScore'] is not None:
-                confidence = create_confidence(insight_constants.CONFIDENCE_SCORE_EXPLICIT,
-                                               insight_model_data['diagnosis']['usage']['explicitScore'])
-                insight_ext.append(confidence)
-            if 'patientReportedScore' in insight_model_data['diagnosis']['usage'] and insight_model_data['diagnosis']['usage']['patientReportedScore'] is not None:
-                confidence = create_confidence(insight_constants.CONFIDENCE_SCORE_PATIENT_REPORTED,
-                                               insight_model_data['diagnosis']['usage']['patientReportedScore'])
-                insight_ext.append(confidence)
-            if 'discussedScore' in insight_model_data['diagnosis']['usage'] and insight_model_data['diagnosis']['usage']['discussedScore'] is not None:
-                confidence = create_confidence(insight_constants.CONFIDENCE_SCORE_DISCUSSED,
-                                               insight_model_data['diagnosis']['usage']['discussedScore'])
-                insight_ext.append(confidence)
-            if 'familyHistoryScore' in insight_model_data['diagnosis']['usage'] and insight_model_data['diagnosis']['usage']['familyHistoryScore'] is not None:
-                confidence = create_confidence(insight_constants.CONFIDENCE_SCORE_FAMILY_HISTORY,
-                                               insight_model_data['diagnosis']['familyHistoryScore'])
-                insight_ext.append(confidence)
-            if 'suspectedScore' in insight_model_data['diagnosis']['usage'] and insight_model_data['diagnosis']['usage']['suspectedScore'] is not None:
-                confidence = create_confidence(insight_constants.CONFIDENCE_SCORE_SUSPECTED,
-                                               insight_model_data['diagnosis']['suspectedScore'])
-                insight_ext.append(confidence)
+    # to_dict() leaves out diagnosis and usage when ACD does not report them
+    diagnosis = insight_model_data.get('diagnosis')
+    if diagnosis is not None:
+        usage = diagnosis.get('usage')
+        if usage is not None:
+            for score_key, confidence_name in DIAGNOSIS_USAGE_CONFIDENCES:
+                score = usage.get(score_key)
+                if score is not None:
+                    insight_ext.append(create_confidence(confidence_name, score))
+        for score_key, confidence_name in DIAGNOSIS_CONFIDENCES:
+            score = diagnosis.get(score_key)
+            if score is not None:
+                insight_ext.append(create_confidence(confidence_name, score))
 
 
 def add_medication_confidences(insight_ext, insight_model_data):
@@ -364,9 +394,10 @@ def get_diagnostic_report_data(diagnostic_report):
     Parameters:
       diagnostic_report - fhir.resources.diagnosticreport object where the text will be retrieved
     '''
-    if diagnostic_report.presentedForm and diagnostic_report.presentedForm[0] and diagnostic_report.presentedForm[0].data:
-        encoded_data = diagnostic_report.presentedForm[0].data
-        byte_text = base64.b64decode(encoded_data)
+    presented_form = diagnostic_report.presentedForm
+    attachment = presented_form[0] if presented_form else None
+    if attachment and attachment.data:
+        byte_text = base64.b64decode(attachment.data)
         text = byte_text.decode('utf8')  # This removes the b'..' around the text string
         return text
     return None
@@ -377,9 +408,10 @@ def get_document_reference_data(document_reference):
     Parameters:
       document_reference - fhir.resources.documentreference object where the text will be retrieved
     '''
-    if document_reference.content and document_reference.content[0] and document_reference.content[0].attachment and document_reference.content[0].attachment.data:
-        encoded_data = document_reference.content[0].attachment.data
-        byte_text = base64.b64decode(encoded_data)
+    content = document_reference.content
+    attachment = content[0].attachment if content and content[0] else None
+    if attachment and attachment.data:
+        byte_text = base64.b64decode(attachment.data)
         text = byte_text.decode('utf8')  # This removes the b'..' around the text string
         return text
     return None